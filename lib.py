@@ -4,29 +4,47 @@ Provides secure file I/O, editing, and search functionality.
 """
 
 import os
+import re
+import stat
 import secrets
-import difflib
+from collections import defaultdict, deque
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
-from fnmatch import fnmatch
+from typing import List, Dict, Optional, Pattern, Sequence, Tuple
+from fnmatch import translate
+
+# Optional: Rust implementation of difflib with identical output
+try:
+    from difflib_rs import unified_diff
+except ImportError:
+    from difflib import unified_diff
 
 from path_utils import normalize_path, expand_home
-from path_validation import is_path_within_allowed_directories
+from path_validation import is_path_within_allowed_directories, resolve_allowed_directories
+
 
+# Global allowed directories - set by the main module. Stored as a tuple so
+# readers can share it without copying
+_allowed_directories: Tuple[str, ...] = ()
 
-# Global allowed directories - set by the main module
-_allowed_directories: List[str] = []
+# Buffer size for buffered file I/O (default is 8 KiB)
+_IO_BUFFER_SIZE = 128 * 1024
 
+# Leading whitespace of a line (same characters str.lstrip removes)
+_LEADING_WHITESPACE = re.compile(r'\s*')
 
-def set_allowed_directories(directories: List[str]) -> None:
+
+def set_allowed_directories(directories: Sequence[str]) -> None:
     """Set allowed directories from the main module."""
     global _allowed_directories
-    _allowed_directories = directories.copy()
+    _allowed_directories = tuple(directories)
+    # Resolve once up front; path checks reuse the cached result
+    resolve_allowed_directories(_allowed_directories)
 
 
-def get_allowed_directories() -> List[str]:
+def get_allowed_directories() -> Tuple[str, ...]:
     """Get current allowed directories."""
-    return _allowed_directories.copy()
+    return _allowed_directories
 
 
 # Utility Functions
@@ -42,18 +60,32 @@ def format_size(bytes_size: int) -> str:
         Formatted size string (e.g., "1.5 MB")
     """
     units = ['B', 'KB', 'MB', 'GB', 'TB']
-    if bytes_size == 0:
-        return '0 B'
+    if bytes_size < 1024:
+        return f"{bytes_size} B"
+    
+    # Each unit is 2**10 times the previous one, so the bit length picks it
+    i = min((bytes_size.bit_length() - 1) // 10, len(units) - 1)
+    return f"{bytes_size / (1 << (10 * i)):.2f} {units[i]}"
+
+
+def compile_glob_patterns(patterns: List[str]) -> Optional[Pattern[str]]:
+    """
+    Compile glob patterns into one regex that matches any of them.
     
-    i = 0
-    size = float(bytes_size)
-    while size >= 1024 and i < len(units) - 1:
-        size /= 1024
-        i += 1
+    Like fnmatch, patterns are case-normalized, so match the result against
+    os.path.normcase'd paths.
     
-    if i == 0:
-        return f"{int(size)} {units[i]}"
-    return f"{size:.2f} {units[i]}"
+    Args:
+        patterns: Glob-style patterns
+        
+    Returns:
+        Compiled regex, or None if there are no patterns
+    """
+    if not patterns:
+        return None
+    return re.compile('|'.join(
+        f"(?:{translate(os.path.normcase(pattern))})" for pattern in patterns
+    ))
 
 
 def normalize_line_endings(text: str) -> str:
@@ -80,7 +112,7 @@ def create_unified_diff(original_content: str, new_content: str, filepath: str =
     original_lines = normalized_original.splitlines(keepends=True)
     new_lines = normalized_new.splitlines(keepends=True)
     
-    diff = difflib.unified_diff(
+    diff = unified_diff(
         original_lines,
         new_lines,
         fromfile=f"{filepath} (original)",
@@ -93,7 +125,7 @@ def create_unified_diff(original_content: str, new_content: str, filepath: str =
 
 # Security & Validation Functions
 
-async def validate_path(requested_path: str) -> str:
+def validate_path(requested_path: str) -> str:
     """
     Validate and resolve a path, ensuring it's within allowed directories.
     
@@ -107,6 +139,10 @@ async def validate_path(requested_path: str) -> str:
         PermissionError: If path is outside allowed directories
         FileNotFoundError: If parent directory doesn't exist for new files
     """
+    # Not cached: the caller opens the returned path later, so the symlink
+    # check must reflect the filesystem at call time. Only the lexical
+    # helpers (expand_home, normalize_path) and allowed-directory
+    # resolution are cached.
     expanded_path = expand_home(requested_path)
     absolute = os.path.abspath(expanded_path)
     normalized_requested = normalize_path(absolute)
@@ -142,9 +178,61 @@ async def validate_path(requested_path: str) -> str:
             raise FileNotFoundError(f"Parent directory does not exist: {parent_dir}")
 
 
+@lru_cache(maxsize=8192)
+def _is_allowed_real_path(real_path: str, allowed_directories: Tuple[str, ...]) -> bool:
+    """Cached containment check for already-resolved paths."""
+    return is_path_within_allowed_directories(real_path, allowed_directories)
+
+
+def validate_symlink_target(link_path: str) -> str:
+    """
+    Resolve a symlink found below an already validated directory and ensure
+    its target is within allowed directories.
+    
+    Args:
+        link_path: Path of the symlink
+        
+    Returns:
+        Resolved target path
+        
+    Raises:
+        PermissionError: If the target is outside allowed directories
+    """
+    real_path = os.path.realpath(link_path)
+    if not _is_allowed_real_path(real_path, _allowed_directories):
+        raise PermissionError(
+            f"Access denied - symlink target outside allowed directories: {real_path} not in {', '.join(_allowed_directories)}"
+        )
+    return real_path
+
+
+def is_link_entry(entry: os.DirEntry) -> bool:
+    """
+    Check whether a scandir entry may lead outside its parent directory.
+    
+    Besides symlinks this covers Windows junctions and other reparse points,
+    which DirEntry.is_symlink() does not report but is_dir() descends into.
+    
+    Args:
+        entry: Directory entry to check
+        
+    Returns:
+        True if the entry must be resolved before it is trusted
+    """
+    if entry.is_symlink():
+        return True
+    if os.name == 'nt':
+        try:
+            attributes = entry.stat(follow_symlinks=False).st_file_attributes
+        except OSError:
+            return True
+        return bool(attributes & stat.FILE_ATTRIBUTE_REPARSE_POINT)
+    return False
+
+
 # File Operations
 
-async def get_file_stats(file_path: str) -> Dict[str, any]:
+def get_file_stats(file_path: str) -> Dict[str, any]:
     """
     Get detailed file statistics.
     
@@ -154,19 +242,21 @@ async def get_file_stats(file_path: str) -> Dict[str, any]:
     Returns:
         Dictionary with file metadata
     """
+    # Derive the file type from the same stat result instead of re-stat'ing
     stats = os.stat(file_path)
+    mode = stats.st_mode
     return {
         'size': format_size(stats.st_size),
         'created': stats.st_ctime,
         'modified': stats.st_mtime,
         'accessed': stats.st_atime,
-        'isDirectory': os.path.isdir(file_path),
-        'isFile': os.path.isfile(file_path),
-        'permissions': oct(stats.st_mode)[-3:],
+        'isDirectory': stat.S_ISDIR(mode),
+        'isFile': stat.S_ISREG(mode),
+        'permissions': f"{mode & 0o777:03o}",
     }
 
 
-async def read_file_content(file_path: str, encoding: str = 'utf-8') -> str:
+def read_file_content(file_path: str, encoding: str = 'utf-8') -> str:
     """
     Read file content as text.
     
@@ -177,11 +267,14 @@ async def read_file_content(file_path: str, encoding: str = 'utf-8') -> str:
     Returns:
         File content as string
     """
-    with open(file_path, 'r', encoding=encoding) as f:
-        return f.read()
+    # Whole-file read: skip the buffered/text layers and decode once
+    with open(file_path, 'rb', buffering=0) as f:
+        content = f.read().decode(encoding)
+    # Translate newlines the same way text mode does
+    return content.replace('\r\n', '\n').replace('\r', '\n')
 
 
-async def write_file_content(file_path: str, content: str) -> None:
+def write_file_content(file_path: str, content: str) -> None:
     """
     Write content to file with atomic operation.
     
@@ -192,23 +285,22 @@ async def write_file_content(file_path: str, content: str) -> None:
     # Security: Use atomic write to prevent race conditions
     temp_path = f"{file_path}.{secrets.token_hex(16)}.tmp"
     try:
-        with open(temp_path, 'w', encoding='utf-8') as f:
+        with open(temp_path, 'w', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
             f.write(content)
         # Atomic rename
         os.replace(temp_path, file_path)
-    except Exception as e:
-        # Clean up temp file on error
-        if os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-            except:
-                pass
-        raise e
+    except Exception:
+        # Clean up temp file on error (it may not exist)
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
 
 
 # File Editing Functions
 
-async def apply_file_edits(
+def apply_file_edits(
     file_path: str,
     edits: List[Dict[str, str]],
     dry_run: bool = False
@@ -224,27 +316,52 @@ async def apply_file_edits(
     Returns:
         Diff string showing changes
     """
-    # Read file content and normalize line endings
-    with open(file_path, 'r', encoding='utf-8') as f:
-        content = normalize_line_endings(f.read())
+    # Read file content in one unbuffered read; line endings come back normalized
+    content = read_file_content(file_path)
     
-    # Apply edits sequentially
+    # Apply edits sequentially. Exact matches work on the content as a string
+    # and fallback matches on its list of lines; whichever form an edit
+    # changes, the other is set to None and rebuilt only when next needed.
     modified_content = content
+    content_lines = None
+    # Line numbers of content_lines keyed by stripped line text, built on
+    # the first fallback match and dropped whenever the content changes
+    line_index = None
     for edit in edits:
         old_text = normalize_line_endings(edit['oldText'])
         new_text = normalize_line_endings(edit['newText'])
         
+        if modified_content is None:
+            modified_content = '\n'.join(content_lines)
+        
         # If exact match exists, use it
-        if old_text in modified_content:
-            modified_content = modified_content.replace(old_text, new_text, 1)
+        match_start = modified_content.find(old_text)
+        if match_start != -1:
+            modified_content = (
+                modified_content[:match_start]
+                + new_text
+                + modified_content[match_start + len(old_text):]
+            )
+            content_lines = None
+            line_index = None
             continue
         
         # Otherwise, try line-by-line matching with flexibility for whitespace
         old_lines = old_text.split('\n')
-        content_lines = modified_content.split('\n')
+        if content_lines is None:
+            content_lines = modified_content.split('\n')
         match_found = False
         
-        for i in range(len(content_lines) - len(old_lines) + 1):
+        if line_index is None:
+            line_index = defaultdict(list)
+            for i, line in enumerate(content_lines):
+                line_index[line.strip()].append(i)
+        
+        # Only lines matching the first old line can start a match
+        last_start = len(content_lines) - len(old_lines)
+        for i in line_index.get(old_lines[0].strip(), ()):
+            if i > last_start:
+                break
             potential_match = content_lines[i:i + len(old_lines)]
             
             # Compare lines with normalized whitespace
@@ -255,7 +372,7 @@ async def apply_file_edits(
             
             if is_match:
                 # Preserve original indentation of first line
-                original_indent = content_lines[i][:len(content_lines[i]) - len(content_lines[i].lstrip())]
+                original_indent = _LEADING_WHITESPACE.match(content_lines[i]).group()
                 new_lines = new_text.split('\n')
                 new_lines_indented = [
                     original_indent + line.lstrip() if j == 0 else line
@@ -263,13 +380,17 @@ async def apply_file_edits(
                 ]
                 
                 content_lines[i:i + len(old_lines)] = new_lines_indented
-                modified_content = '\n'.join(content_lines)
+                modified_content = None
+                line_index = None
                 match_found = True
                 break
         
         if not match_found:
             raise ValueError(f"Could not find exact match for edit:\n{edit['oldText']}")
     
+    if modified_content is None:
+        modified_content = '\n'.join(content_lines)
+    
     # Create unified diff
     diff = create_unified_diff(content, modified_content, file_path)
     
@@ -280,12 +401,12 @@ async def apply_file_edits(
     formatted_diff = f"{'`' * num_backticks}diff\n{diff}\n{'`' * num_backticks}\n\n"
     
     if not dry_run:
-        await write_file_content(file_path, modified_content)
+        write_file_content(file_path, modified_content)
     
     return formatted_diff
 
 
-async def tail_file(file_path: str, num_lines: int) -> str:
+def tail_file(file_path: str, num_lines: int) -> str:
     """
     Get the last N lines of a file efficiently.
     
@@ -297,6 +418,8 @@ async def tail_file(file_path: str, num_lines: int) -> str:
         Last N lines as string
     """
     CHUNK_SIZE = 1024
+    LARGE_FILE_THRESHOLD = 64 * 1024
+    BLOCK_SIZE = 64 * 1024
     
     with open(file_path, 'rb') as f:
         f.seek(0, os.SEEK_END)
@@ -305,7 +428,32 @@ async def tail_file(file_path: str, num_lines: int) -> str:
         if file_size == 0:
             return ''
         
-        lines = []
+        # Large files: read large blocks backwards until they hold N newlines,
+        # then decode only the slice after the Nth-from-last one. Plain reads
+        # (not mmap) so a file truncated meanwhile just yields less data.
+        if file_size > LARGE_FILE_THRESHOLD:
+            if num_lines <= 0:
+                return ''
+            blocks = []
+            position = file_size
+            newline_count = 0
+            while position > 0 and newline_count < num_lines:
+                size = min(BLOCK_SIZE, position)
+                position -= size
+                f.seek(position)
+                block = f.read(size)
+                blocks.append(block)
+                newline_count += block.count(b'\n')
+            data = b''.join(reversed(blocks))
+            start = len(data)
+            for _ in range(num_lines):
+                start = data.rfind(b'\n', 0, start)
+                if start == -1:
+                    break
+            lines = normalize_line_endings(data[start + 1:].decode('utf-8', errors='ignore')).split('\n')
+            return '\n'.join(lines[-num_lines:])
+        
+        lines = deque()
         position = file_size
         remaining_text = ''
         
@@ -323,12 +471,12 @@ async def tail_file(file_path: str, num_lines: int) -> str:
             
             for line in reversed(chunk_lines):
                 if len(lines) < num_lines:
-                    lines.insert(0, line)
+                    lines.appendleft(line)
         
         return '\n'.join(lines)
 
 
-async def head_file(file_path: str, num_lines: int) -> str:
+def head_file(file_path: str, num_lines: int) -> str:
     """
     Get the first N lines of a file efficiently.
     
@@ -340,7 +488,7 @@ async def head_file(file_path: str, num_lines: int) -> str:
         First N lines as string
     """
     lines = []
-    with open(file_path, 'r', encoding='utf-8') as f:
+    with open(file_path, 'r', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
         for i, line in enumerate(f):
             if i >= num_lines:
                 break
@@ -349,10 +497,10 @@ async def head_file(file_path: str, num_lines: int) -> str:
     return '\n'.join(lines)
 
 
-async def search_files_with_validation(
+def search_files_with_validation(
     root_path: str,
     pattern: str,
-    allowed_directories: List[str],
+    allowed_directories: Sequence[str],
     exclude_patterns: Optional[List[str]] = None
 ) -> List[str]:
     """
@@ -372,38 +520,68 @@ async def search_files_with_validation(
     
     results = []
     
-    async def search(current_path: str):
-        try:
-            entries = os.listdir(current_path)
-        except PermissionError:
-            return
+    # Compile glob patterns once; like fnmatch, match case-normalized paths
+    pattern_re = compile_glob_patterns([pattern])
+    exclude_re = compile_glob_patterns(exclude_patterns)
+    
+    # root_path is validated and resolved, so plain entries below it are
+    # inside the allowed directories; only links (symlinks, junctions) need a
+    # containment check
+    root_prefix_len = len(os.path.join(root_path, ''))
+    
+    # Validated symlink targets keyed by the symlink's real location (None if
+    # outside allowed directories), so a directory reached through several
+    # paths has its symlinks resolved once per search
+    symlink_targets: Dict[str, Optional[str]] = {}
+    
+    try:
+        with os.scandir(root_path) as it:
+            stack = [(iter(list(it)), root_path)]
+    except PermissionError:
+        return results
+    
+    # Depth-first walk over a stack of (directory iterator, directory real
+    # path), visiting entries in the same order as the recursive walk
+    while stack:
+        entries, dir_real_path = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
         
-        for entry in entries:
-            full_path = os.path.join(current_path, entry)
-            
-            try:
-                await validate_path(full_path)
-                
-                relative_path = os.path.relpath(full_path, root_path)
-                
-                # Check exclude patterns
-                should_exclude = any(
-                    fnmatch(relative_path, exclude_pattern)
-                    for exclude_pattern in exclude_patterns
-                )
-                
-                if should_exclude:
+        full_path = entry.path
+        real_path = None
+        
+        try:
+            # Security: skip links whose target is outside allowed directories
+            if is_link_entry(entry):
+                link_path = os.path.join(dir_real_path, entry.name)
+                if link_path not in symlink_targets:
+                    target = os.path.realpath(link_path)
+                    if not is_path_within_allowed_directories(target, allowed_directories):
+                        target = None
+                    symlink_targets[link_path] = target
+                real_path = symlink_targets[link_path]
+                if real_path is None:
                     continue
-                
-                # Check if matches search pattern
-                if fnmatch(relative_path, pattern):
-                    results.append(full_path)
-                
-                # Recurse into directories
-                if os.path.isdir(full_path):
-                    await search(full_path)
-            except (PermissionError, FileNotFoundError):
+            
+            relative_path = os.path.normcase(full_path[root_prefix_len:])
+            
+            # Check exclude patterns
+            if exclude_re and exclude_re.match(relative_path):
                 continue
+            
+            # Check if matches search pattern
+            if pattern_re.match(relative_path):
+                results.append(full_path)
+            
+            # Descend into directories
+            if entry.is_dir():
+                if real_path is None:
+                    real_path = os.path.join(dir_real_path, entry.name)
+                with os.scandir(full_path) as it:
+                    stack.append((iter(list(it)), real_path))
+        except OSError:
+            continue
     
-    await search(root_path)
     return results
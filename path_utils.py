@@ -4,10 +4,18 @@ Based on the MCP filesystem server TypeScript implementation.
 """
 
 import os
+import re
 import platform
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
 
 
+_IS_WINDOWS = platform.system() == 'Windows'
+_MULTI_SLASH = re.compile(r'/+')
+
+
+@lru_cache(maxsize=4096)
 def convert_to_windows_path(p: str) -> str:
     """
     Converts WSL or Unix-style Windows paths to Windows format.
@@ -26,7 +34,7 @@ def convert_to_windows_path(p: str) -> str:
     # Handle Unix-style Windows paths (/c/...)
     # Only convert when running on Windows
     if p.startswith('/') and len(p) > 2 and p[1].isalpha() and p[2] == '/':
-        if platform.system() == 'Windows':
+        if _IS_WINDOWS:
             drive_letter = p[1].upper()
             path_part = p[2:].replace('/', '\\')
             return f"{drive_letter}:{path_part}"
@@ -39,15 +47,16 @@ def convert_to_windows_path(p: str) -> str:
     return p
 
 
-def normalize_path(p: str) -> str:
+@lru_cache(maxsize=4096)
+def _normalize_path_lexically(p: str) -> Tuple[str, bool]:
     """
-    Normalizes path by standardizing format while preserving OS-specific behavior.
+    Pure string part of normalize_path, safe to cache.
     
     Args:
         p: The path to normalize
         
     Returns:
-        Normalized path
+        Tuple of (path, whether it still needs resolving against the filesystem)
     """
     # Remove any surrounding quotes and whitespace
     p = p.strip().strip('"').strip("'")
@@ -57,32 +66,48 @@ def normalize_path(p: str) -> str:
         # Always preserve WSL paths (/mnt/c/, /mnt/d/, etc.)
         (p.startswith('/mnt/') and len(p) > 5 and p[5].isalpha() and p[6] == '/') or
         # On non-Windows platforms, treat all absolute paths as Unix paths
-        (platform.system() != 'Windows') or
+        (not _IS_WINDOWS) or
         # On Windows, preserve Unix paths that aren't Unix-style Windows paths
-        (platform.system() == 'Windows' and not (len(p) > 2 and p[1].isalpha() and p[2] == '/'))
+        (_IS_WINDOWS and not (len(p) > 2 and p[1].isalpha() and p[2] == '/'))
     )
     
     if is_unix_path:
         # For Unix paths, just normalize without converting to Windows format
         # Replace double slashes with single slashes and remove trailing slashes
-        import re
-        p = re.sub(r'/+', '/', p)
+        p = _MULTI_SLASH.sub('/', p)
         p = p.rstrip('/')
-        return p if p else '/'
+        return (p if p else '/'), False
     
     # Convert Unix-style Windows paths to Windows format if on Windows
-    p = convert_to_windows_path(p)
+    return convert_to_windows_path(p), True
+
+
+def normalize_path(p: str) -> str:
+    """
+    Normalizes path by standardizing format while preserving OS-specific behavior.
+    
+    Args:
+        p: The path to normalize
+        
+    Returns:
+        Normalized path
+    """
+    p, needs_resolve = _normalize_path_lexically(p)
+    if not needs_resolve:
+        return p
     
-    # Use pathlib for normalization
+    # Use pathlib for normalization. Not cached: the result depends on
+    # symlinks and junctions that can change while the server runs
     normalized = str(Path(p).resolve())
     
     # On Windows, ensure drive letter is capitalized
-    if platform.system() == 'Windows' and len(normalized) > 1 and normalized[1] == ':':
+    if _IS_WINDOWS and len(normalized) > 1 and normalized[1] == ':':
         normalized = normalized[0].upper() + normalized[1:]
     
     return normalized
 
 
+@lru_cache(maxsize=4096)
 def expand_home(filepath: str) -> str:
     """
     Expands home directory tildes in paths.
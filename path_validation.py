@@ -4,26 +4,134 @@ Ensures filesystem operations only occur within allowed directories.
 """
 
 import os
+from functools import lru_cache
 from pathlib import Path
-from typing import List
+from typing import List, Sequence, Tuple
+
+
+@lru_cache(maxsize=32)
+def _resolve_allowed_directories(allowed_directories: Tuple[str, ...]) -> Tuple[str, ...]:
+    """
+    Resolves a set of allowed directories once and caches the result.
+    
+    Args:
+        allowed_directories: Allowed directory paths
+        
+    Returns:
+        Resolved allowed directories, skipping invalid entries
+        
+    Raises:
+        ValueError: If an allowed directory is relative after normalization
+    """
+    resolved = []
+    for dir_path in allowed_directories:
+        if not dir_path:
+            continue
+        
+        # Reject null bytes in allowed dirs
+        if '\x00' in dir_path:
+            continue
+        
+        # Normalize the allowed directory
+        try:
+            normalized_dir = str(Path(dir_path).resolve())
+        except Exception:
+            continue
+        
+        # Verify allowed directory is absolute after normalization
+        if not Path(normalized_dir).is_absolute():
+            raise ValueError('Allowed directories must be absolute paths after normalization')
+        
+        resolved.append(normalized_dir)
+    
+    return tuple(resolved)
+
+
+def resolve_allowed_directories(allowed_directories: Sequence[str]) -> Tuple[str, ...]:
+    """
+    Returns the resolved form of the allowed directories.
+    
+    Results are cached per distinct set of directories, so repeated checks
+    against the same set do not resolve them again.
+    
+    Args:
+        allowed_directories: Allowed directory paths
+        
+    Returns:
+        Resolved allowed directories
+    """
+    return _resolve_allowed_directories(
+        tuple(dir_path for dir_path in allowed_directories if isinstance(dir_path, str))
+    )
+
+
+@lru_cache(maxsize=32)
+def _allowed_directory_prefixes(resolved_directories: Tuple[str, ...]) -> Tuple[Tuple[str, str], ...]:
+    """
+    Builds (directory, directory-with-trailing-separator) pairs for prefix checks.
+    
+    Both forms are case-normalized so comparisons match the platform's
+    path semantics (case-insensitive on Windows).
+    
+    Args:
+        resolved_directories: Resolved allowed directories
+        
+    Returns:
+        Tuple of (directory, prefix) pairs
+    """
+    prefixes = []
+    for normalized_dir in resolved_directories:
+        normalized_dir = os.path.normcase(normalized_dir)
+        # Filesystem roots ("/", "C:\\") already end with a separator
+        prefix = normalized_dir if normalized_dir.endswith(os.sep) else normalized_dir + os.sep
+        prefixes.append((normalized_dir, prefix))
+    return tuple(prefixes)
+
+
+def _matches_allowed_prefix(normalized_path: str, prefixes: Tuple[Tuple[str, str], ...]) -> bool:
+    """
+    Checks a normalized path against (directory, prefix) pairs.
+    
+    Args:
+        normalized_path: Absolute, normalized path
+        prefixes: Pairs from _allowed_directory_prefixes
+        
+    Returns:
+        True if the path is one of the directories or below one of them
+    """
+    # Path is inside if it's the same or a subdirectory
+    normalized_path = os.path.normcase(normalized_path)
+    for normalized_dir, prefix in prefixes:
+        if normalized_path == normalized_dir or normalized_path.startswith(prefix):
+            return True
+    return False
 
 
 def is_path_within_allowed_directories(absolute_path: str, allowed_directories: List[str]) -> bool:
     """
     Checks if an absolute path is within any of the allowed directories.
     
+    A path that is lexically inside an allowed directory is accepted without
+    touching the filesystem; other paths are resolved first, since they may
+    reach an allowed directory through a symlink. Paths containing '..' are
+    always resolved, because '..' after a symlinked subdirectory climbs out
+    of the symlink's target rather than back into the allowed directory. Symlinks below an allowed
+    directory are not followed, so callers must also check the resolved path
+    before using it (as validate_path does).
+    
     Args:
         absolute_path: The absolute path to check
         allowed_directories: Array of absolute allowed directory paths
         
     Returns:
         True if the path is within an allowed directory, False otherwise
+        (including for relative paths)
         
     Raises:
-        ValueError: If given relative paths after normalization
+        ValueError: If allowed directories are relative after normalization
     """
     # Type validation
-    if not isinstance(absolute_path, str) or not isinstance(allowed_directories, list):
+    if not isinstance(absolute_path, str) or not isinstance(allowed_directories, (list, tuple)):
         return False
     
     # Reject empty inputs
@@ -34,47 +142,20 @@ def is_path_within_allowed_directories(absolute_path: str, allowed_directories:
     if '\x00' in absolute_path:
         return False
     
-    # Normalize the input path
+    # Reject relative paths
+    if not os.path.isabs(absolute_path):
+        return False
+    
+    prefixes = _allowed_directory_prefixes(resolve_allowed_directories(allowed_directories))
+    
+    # Fast path: lexically inside an allowed directory
+    if '..' not in absolute_path and _matches_allowed_prefix(os.path.normpath(absolute_path), prefixes):
+        return True
+    
+    # Slow path: resolve symlinks and aliases of allowed directories
     try:
         normalized_path = str(Path(absolute_path).resolve())
     except Exception:
         return False
     
-    # Verify it's absolute after normalization
-    if not Path(normalized_path).is_absolute():
-        raise ValueError('Path must be absolute after normalization')
-    
-    # Check against each allowed directory
-    for dir_path in allowed_directories:
-        if not isinstance(dir_path, str) or not dir_path:
-            continue
-        
-        # Reject null bytes in allowed dirs
-        if '\x00' in dir_path:
-            continue
-        
-        # Normalize the allowed directory
-        try:
-            normalized_dir = str(Path(dir_path).resolve())
-        except Exception:
-            continue
-        
-        # Verify allowed directory is absolute after normalization
-        if not Path(normalized_dir).is_absolute():
-            raise ValueError('Allowed directories must be absolute paths after normalization')
-        
-        # Check if normalized_path is within normalized_dir
-        # Path is inside if it's the same or a subdirectory
-        if normalized_path == normalized_dir:
-            return True
-        
-        # Check if path is a subdirectory
-        try:
-            # Use relative_to to check if path is within directory
-            Path(normalized_path).relative_to(normalized_dir)
-            return True
-        except ValueError:
-            # Not a subdirectory, continue checking other allowed directories
-            continue
-    
-    return False
+    return _matches_allowed_prefix(normalized_path, prefixes)
@@ -4,6 +4,7 @@ Handles parsing and validation of root directories from MCP client.
 """
 
 import os
+import sys
 from pathlib import Path
 from typing import List, Optional
 from path_utils import normalize_path
@@ -74,14 +75,15 @@ async def get_valid_root_directories(requested_roots: List[dict]) -> List[str]:
         Array of validated directory paths
     """
     validated_directories: List[str] = []
+    # Collected and written to stderr in one call at the end
+    error_lines: List[str] = []
     
     for requested_root in requested_roots:
         root_uri = requested_root.get('uri', '')
         resolved_path = await parse_root_uri(root_uri)
         
         if not resolved_path:
-            print(format_directory_error(root_uri, reason='invalid path or inaccessible'), 
-                  file=__import__('sys').stderr)
+            error_lines.append(format_directory_error(root_uri, reason='invalid path or inaccessible'))
             continue
         
         try:
@@ -89,10 +91,11 @@ async def get_valid_root_directories(requested_roots: List[dict]) -> List[str]:
             if path_obj.is_dir():
                 validated_directories.append(resolved_path)
             else:
-                print(format_directory_error(resolved_path, reason='non-directory root'), 
-                      file=__import__('sys').stderr)
+                error_lines.append(format_directory_error(resolved_path, reason='non-directory root'))
         except Exception as error:
-            print(format_directory_error(resolved_path, error=error), 
-                  file=__import__('sys').stderr)
+            error_lines.append(format_directory_error(resolved_path, error=error))
+    
+    if error_lines:
+        sys.stderr.write('\n'.join(error_lines) + '\n')
     
     return validated_directories
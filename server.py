@@ -6,19 +6,44 @@ Based on the official TypeScript implementation from modelcontextprotocol/server
 
 import sys
 import os
-import base64
+import stat
+import asyncio
+import binascii
+import errno
 import json
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Tuple, Any
 
 from mcp.server.fastmcp import FastMCP
 
+# Optional: faster event loop (not available on Windows)
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Optional: faster sorting for very large directory listings
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Optional: faster JSON encoder
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from path_utils import normalize_path, expand_home
 from roots_utils import get_valid_root_directories
 from lib import (
     set_allowed_directories,
     get_allowed_directories,
     validate_path,
+    validate_symlink_target,
+    is_link_entry,
     read_file_content,
     write_file_content,
     get_file_stats,
@@ -26,6 +51,7 @@ from lib import (
     tail_file,
     head_file,
     search_files_with_validation,
+    compile_glob_patterns,
     format_size,
 )
 
@@ -44,24 +70,29 @@ if len(args) == 0:
 async def initialize_allowed_directories(dirs: List[str]) -> List[str]:
     """Initialize and validate allowed directories."""
     validated_dirs = []
+    # Canonical form of each absolute path, so repeated arguments resolve once
+    canonical_dirs: Dict[str, str] = {}
     for dir_path in dirs:
         expanded = expand_home(dir_path)
         absolute = os.path.abspath(expanded)
+        if absolute not in canonical_dirs:
+            try:
+                # Resolve symlinks for security
+                resolved = str(Path(absolute).resolve())
+                canonical_dirs[absolute] = normalize_path(resolved)
+            except Exception:
+                # If can't resolve, use normalized absolute path
+                canonical_dirs[absolute] = normalize_path(absolute)
+        validated_dirs.append(canonical_dirs[absolute])
+    
+    # Validate that all directories exist and are accessible (one stat each)
+    for dir_path in dict.fromkeys(validated_dirs):
         try:
-            # Resolve symlinks for security
-            resolved = str(Path(absolute).resolve())
-            normalized = normalize_path(resolved)
-            validated_dirs.append(normalized)
-        except Exception:
-            # If can't resolve, use normalized absolute path
-            validated_dirs.append(normalize_path(absolute))
-    
-    # Validate that all directories exist and are accessible
-    for dir_path in validated_dirs:
-        if not os.path.exists(dir_path):
+            dir_stat = os.stat(dir_path)
+        except OSError:
             print(f"Error: {dir_path} does not exist", file=sys.stderr)
             sys.exit(1)
-        if not os.path.isdir(dir_path):
+        if not stat.S_ISDIR(dir_stat.st_mode):
             print(f"Error: {dir_path} is not a directory", file=sys.stderr)
             sys.exit(1)
     
@@ -71,12 +102,42 @@ async def initialize_allowed_directories(dirs: List[str]) -> List[str]:
 # Initialize FastMCP server
 mcp = FastMCP("mcp-filesystem-server")
 
+# Shared pool for scanning sibling directories in directory_tree
+_directory_scan_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="scandir")
+
+
+# Helper functions to read media files
+def encode_file_base64(file_path: str) -> str:
+    """Read a file into a buffer sized from its stat, then base64-encode it."""
+    with open(file_path, 'rb', buffering=0) as f:
+        buffer = bytearray(os.fstat(f.fileno()).st_size)
+        filled = 0
+        with memoryview(buffer) as view:
+            while filled < len(buffer):
+                count = f.readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+        # The file may have changed size since the stat
+        if filled < len(buffer):
+            del buffer[filled:]
+        else:
+            buffer += f.read()
+    return binascii.b2a_base64(buffer, newline=False).decode('ascii')
+
 
-# Helper function to read media files
 async def read_file_as_base64(file_path: str) -> str:
     """Read a file and encode as base64."""
-    with open(file_path, 'rb') as f:
-        return base64.b64encode(f.read()).decode('utf-8')
+    return await asyncio.to_thread(encode_file_base64, file_path)
+
+
+# Helper function for directory entries
+def is_directory_entry(entry: os.DirEntry) -> bool:
+    """Like os.path.isdir for a scandir entry: follows symlinks, False on errors."""
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
 
 
 # Tool: read_text_file
@@ -93,17 +154,17 @@ async def read_text_file(path: str, tail: Optional[int] = None, head: Optional[i
     Returns:
         File content as string
     """
-    valid_path = await validate_path(path)
+    valid_path = validate_path(path)
     
     if head is not None and tail is not None:
         raise ValueError("Cannot specify both head and tail parameters simultaneously")
     
     if tail is not None:
-        content = await tail_file(valid_path, tail)
+        content = await asyncio.to_thread(tail_file, valid_path, tail)
     elif head is not None:
-        content = await head_file(valid_path, head)
+        content = await asyncio.to_thread(head_file, valid_path, head)
     else:
-        content = await read_file_content(valid_path)
+        content = await asyncio.to_thread(read_file_content, valid_path)
     
     return content
 
@@ -120,15 +181,20 @@ async def read_multiple_files(paths: List[str]) -> str:
     Returns:
         Combined file contents separated by ---
     """
-    results = []
-    for file_path in paths:
-        try:
-            valid_path = await validate_path(file_path)
-            content = await read_file_content(valid_path)
-            results.append(f"{file_path}:\n{content}\n")
-        except Exception as error:
-            results.append(f"{file_path}: Error - {str(error)}")
-    
+    # Read files concurrently, capping how many are open at once
+    semaphore = asyncio.Semaphore(32)
+    
+    async def read_one(file_path: str) -> str:
+        async with semaphore:
+            try:
+                valid_path = validate_path(file_path)
+                content = await asyncio.to_thread(read_file_content, valid_path)
+                return f"{file_path}:\n{content}\n"
+            except Exception as error:
+                return f"{file_path}: Error - {str(error)}"
+    
+    # gather returns results in input order
+    results = await asyncio.gather(*(read_one(file_path) for file_path in paths))
     return "\n---\n".join(results)
 
 
@@ -145,8 +211,8 @@ async def write_file(path: str, content: str) -> str:
     Returns:
         Success message
     """
-    valid_path = await validate_path(path)
-    await write_file_content(valid_path, content)
+    valid_path = validate_path(path)
+    await asyncio.to_thread(write_file_content, valid_path, content)
     return f"Successfully wrote to {path}"
 
 
@@ -164,8 +230,8 @@ async def edit_file(path: str, edits: List[Dict[str, str]], dryRun: bool = False
     Returns:
         Diff showing the changes
     """
-    valid_path = await validate_path(path)
-    result = await apply_file_edits(valid_path, edits, dryRun)
+    valid_path = validate_path(path)
+    result = await asyncio.to_thread(apply_file_edits, valid_path, edits, dryRun)
     return result
 
 
@@ -181,8 +247,8 @@ async def create_directory(path: str) -> str:
     Returns:
         Success message
     """
-    valid_path = await validate_path(path)
-    os.makedirs(valid_path, exist_ok=True)
+    valid_path = validate_path(path)
+    await asyncio.to_thread(os.makedirs, valid_path, exist_ok=True)
     return f"Successfully created directory {path}"
 
 
@@ -198,16 +264,17 @@ async def list_directory(path: str) -> str:
     Returns:
         Directory listing with [FILE] and [DIR] prefixes
     """
-    valid_path = await validate_path(path)
-    entries = os.listdir(valid_path)
+    def scan(current_path: str) -> List[Tuple[str, bool]]:
+        with os.scandir(current_path) as it:
+            return sorted((entry.name, is_directory_entry(entry)) for entry in it)
     
-    formatted = []
-    for entry in sorted(entries):
-        entry_path = os.path.join(valid_path, entry)
-        prefix = "[DIR]" if os.path.isdir(entry_path) else "[FILE]"
-        formatted.append(f"{prefix} {entry}")
+    valid_path = validate_path(path)
+    entries = await asyncio.to_thread(scan, valid_path)
     
-    return "\n".join(formatted)
+    return "\n".join([
+        f"[DIR] {name}" if is_directory else f"[FILE] {name}"
+        for name, is_directory in entries
+    ])
 
 
 # Tool: list_directory_with_sizes
@@ -223,45 +290,61 @@ async def list_directory_with_sizes(path: str, sortBy: str = "name") -> str:
     Returns:
         Detailed directory listing with sizes and summary
     """
-    valid_path = await validate_path(path)
-    entries = os.listdir(valid_path)
-    
-    detailed_entries = []
-    for entry in entries:
-        entry_path = os.path.join(valid_path, entry)
-        try:
-            stats = os.stat(entry_path)
-            detailed_entries.append({
-                'name': entry,
-                'isDirectory': os.path.isdir(entry_path),
-                'size': stats.st_size,
-                'mtime': stats.st_mtime
-            })
-        except Exception:
-            detailed_entries.append({
-                'name': entry,
-                'isDirectory': os.path.isdir(entry_path),
-                'size': 0,
-                'mtime': 0
-            })
-    
-    # Sort entries
+    def scan(current_path: str) -> Tuple[List[str], List[bool], List[int]]:
+        with os.scandir(current_path) as it:
+            entries = list(it)
+        
+        # In large directories, stat entries in inode order so uncached inode
+        # reads are mostly sequential; results keep the directory order.
+        # (DirEntry.inode() needs an extra syscall on Windows.)
+        stat_order = range(len(entries))
+        if os.name != 'nt' and len(entries) > 256:
+            stat_order = sorted(stat_order, key=lambda i: entries[i].inode())
+        
+        # Entry details as parallel lists, indexed like entries
+        names = [entry.name for entry in entries]
+        is_directories = [False] * len(entries)
+        sizes = [0] * len(entries)
+        for i in stat_order:
+            entry = entries[i]
+            is_directories[i] = is_directory_entry(entry)
+            try:
+                sizes[i] = entry.stat().st_size
+            except Exception:
+                pass
+        return names, is_directories, sizes
+    
+    valid_path = validate_path(path)
+    names, is_directories, sizes = await asyncio.to_thread(scan, valid_path)
+    count = len(names)
+    
+    # Sort entry indices (stable, so ties keep directory order)
     if sortBy == 'size':
-        detailed_entries.sort(key=lambda x: x['size'], reverse=True)
+        if np is not None and count > 10000:
+            order = np.argsort(-np.array(sizes, dtype=np.int64), kind='stable').tolist()
+        else:
+            order = sorted(range(count), key=sizes.__getitem__, reverse=True)
     else:
-        detailed_entries.sort(key=lambda x: x['name'])
+        order = sorted(range(count), key=names.__getitem__)
     
-    # Format output
+    # Format output and add up the summary in the same pass
     formatted = []
-    for entry in detailed_entries:
-        prefix = "[DIR]" if entry['isDirectory'] else "[FILE]"
-        size_str = "" if entry['isDirectory'] else format_size(entry['size']).rjust(10)
-        formatted.append(f"{prefix} {entry['name'].ljust(30)} {size_str}")
-    
-    # Add summary
-    total_files = sum(1 for e in detailed_entries if not e['isDirectory'])
-    total_dirs = sum(1 for e in detailed_entries if e['isDirectory'])
-    total_size = sum(e['size'] for e in detailed_entries if not e['isDirectory'])
+    total_files = total_dirs = total_size = 0
+    # Many files share a size; format each distinct size once per request
+    size_strings: Dict[int, str] = {}
+    for i in order:
+        name = names[i]
+        size = sizes[i]
+        if is_directories[i]:
+            total_dirs += 1
+            formatted.append(f"[DIR] {name:<30} ")
+        else:
+            total_files += 1
+            total_size += size
+            size_str = size_strings.get(size)
+            if size_str is None:
+                size_str = size_strings[size] = f"{format_size(size):>10}"
+            formatted.append(f"[FILE] {name:<30} {size_str}")
     
     formatted.append("")
     formatted.append(f"Total: {total_files} files, {total_dirs} directories")
@@ -286,38 +369,80 @@ async def directory_tree(path: str, excludePatterns: Optional[List[str]] = None)
     if excludePatterns is None:
         excludePatterns = []
     
-    async def build_tree(current_path: str, root_path: str) -> List[Dict]:
-        valid_path = await validate_path(current_path)
-        entries = os.listdir(valid_path)
-        result = []
+    # One regex for all exclude patterns; like fnmatch, match case-normalized paths
+    exclude_re = compile_glob_patterns(excludePatterns)
+    
+    def scan(current_path: str) -> List[os.DirEntry]:
+        with os.scandir(current_path) as it:
+            return sorted(it, key=lambda entry: entry.name)
+    
+    def scan_subdirectory(subdirectory) -> Optional[List[os.DirEntry]]:
+        entry = subdirectory[0]
+        try:
+            # Security: the root is validated and plain subdirectories stay
+            # inside it; symlinks and junctions must resolve inside too
+            if is_link_entry(entry):
+                validate_symlink_target(entry.path)
+            return scan(entry.path)
+        except OSError:
+            return None
+    
+    def build_tree(root_path: str) -> List[Dict]:
+        tree: List[Dict] = []
+        # Scanned directories still to process: (entries, relative path prefix,
+        # children list to fill)
+        pending = [(scan(root_path), '', tree)]
         
-        for entry in sorted(entries):
-            entry_path = os.path.join(current_path, entry)
-            relative_path = os.path.relpath(entry_path, root_path)
-            
-            # Check exclude patterns
-            from fnmatch import fnmatch
-            should_exclude = any(fnmatch(relative_path, pattern) for pattern in excludePatterns)
-            if should_exclude:
-                continue
-            
-            entry_data = {
-                'name': entry,
-                'type': 'directory' if os.path.isdir(entry_path) else 'file'
-            }
-            
-            if os.path.isdir(entry_path):
-                try:
-                    entry_data['children'] = await build_tree(entry_path, root_path)
-                except Exception:
+        while pending:
+            entries, relative_dir, result = pending.pop()
+            subdirectories = []
+            for entry in entries:
+                relative_path = relative_dir + entry.name
+                
+                # Check exclude patterns
+                if exclude_re and exclude_re.match(os.path.normcase(relative_path)):
+                    continue
+                
+                is_directory = is_directory_entry(entry)
+                entry_data = {
+                    'name': entry.name,
+                    'type': 'directory' if is_directory else 'file'
+                }
+                
+                if is_directory:
                     entry_data['children'] = []
+                    subdirectories.append((entry, relative_path, entry_data['children']))
+                
+                result.append(entry_data)
             
-            result.append(entry_data)
+            # Scan subdirectories in inode order for disk locality; output order
+            # is already fixed by the children lists placed above.
+            # (DirEntry.inode() needs an extra syscall on Windows.)
+            if os.name != 'nt':
+                subdirectories.sort(key=lambda subdirectory: subdirectory[0].inode())
+            # Wide levels are scanned concurrently; scandir releases the GIL
+            if len(subdirectories) > 1:
+                scans = _directory_scan_executor.map(scan_subdirectory, subdirectories)
+            else:
+                scans = map(scan_subdirectory, subdirectories)
+            for (entry, relative_path, children), entries in zip(subdirectories, scans):
+                if entries is not None:
+                    pending.append((entries, relative_path + os.sep, children))
         
-        return result
-    
-    valid_path = await validate_path(path)
-    tree_data = await build_tree(valid_path, valid_path)
+        return tree
+    
+    valid_path = validate_path(path)
+    tree_data = await asyncio.to_thread(build_tree, valid_path)
+    # orjson matches json.dumps exactly for ASCII-only output, but leaves
+    # non-ASCII unescaped and rejects names with surrogates (undecodable
+    # bytes), so those trees go through json.dumps
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(tree_data, option=orjson.OPT_INDENT_2)
+        except orjson.JSONEncodeError:
+            encoded = None
+        if encoded is not None and encoded.isascii():
+            return encoded.decode('ascii')
     return json.dumps(tree_data, indent=2)
 
 
@@ -334,10 +459,25 @@ async def move_file(source: str, destination: str) -> str:
     Returns:
         Success message
     """
-    valid_source = await validate_path(source)
-    valid_dest = await validate_path(destination)
-    
-    os.rename(valid_source, valid_dest)
+    def move(source_path: str, dest_path: str) -> None:
+        try:
+            os.rename(source_path, dest_path)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            # shutil.move would move into an existing directory; fail like
+            # os.rename does on the same filesystem
+            if os.path.isdir(dest_path):
+                raise IsADirectoryError(
+                    errno.EISDIR, os.strerror(errno.EISDIR), source_path, None, dest_path
+                ) from None
+            # Across filesystems; shutil copies in-kernel where the OS supports it
+            shutil.move(source_path, dest_path)
+    
+    valid_source = validate_path(source)
+    valid_dest = validate_path(destination)
+    
+    await asyncio.to_thread(move, valid_source, valid_dest)
     return f"Successfully moved {source} to {destination}"
 
 
@@ -358,9 +498,11 @@ async def search_files(path: str, pattern: str, excludePatterns: Optional[List[s
     if excludePatterns is None:
         excludePatterns = []
     
-    valid_path = await validate_path(path)
+    valid_path = validate_path(path)
     allowed_dirs = get_allowed_directories()
-    results = await search_files_with_validation(valid_path, pattern, allowed_dirs, excludePatterns)
+    results = await asyncio.to_thread(
+        search_files_with_validation, valid_path, pattern, allowed_dirs, excludePatterns
+    )
     
     return "\n".join(results) if results else "No matches found"
 
@@ -377,10 +519,10 @@ async def get_file_info(path: str) -> str:
     Returns:
         File metadata as formatted text
     """
-    valid_path = await validate_path(path)
-    info = await get_file_stats(valid_path)
+    valid_path = validate_path(path)
+    info = get_file_stats(valid_path)
     
-    return "\n".join(f"{key}: {value}" for key, value in info.items())
+    return "\n".join([f"{key}: {value}" for key, value in info.items()])
 
 
 # Tool: list_allowed_directories
@@ -399,8 +541,6 @@ async def list_allowed_directories() -> str:
 # Main entry point
 if __name__ == "__main__":
     # Initialize allowed directories from command line args
-    import asyncio
-    
     async def setup():
         if args:
             allowed_dirs = await initialize_allowed_directories(args)
@@ -413,5 +553,7 @@ if __name__ == "__main__":
     # Run setup
     asyncio.run(setup())
     
-    # Run the server
+    # Run the server (FastMCP creates its loop from the current policy)
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     mcp.run()
\ No newline at end of file